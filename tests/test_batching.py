@@ -0,0 +1,146 @@
+"""Padded CTC decoding and cross-file batch scheduling."""
+import argparse
+import types
+import unittest
+from unittest import mock
+
+try:
+    import torch
+except ImportError:  # pragma: no cover - torch is optional for these tests
+    torch = None
+
+import transcribe
+from transcribe import ctc_greedy_decode, transcribe_batch
+
+BLANK_ID = 3
+
+
+class _Tokenizer:
+    def decode(self, tokens):
+        return ",".join(map(str, tokens))
+
+
+def _one_hot(labels):
+    return torch.nn.functional.one_hot(torch.tensor(labels), BLANK_ID + 1).float()
+
+
+@unittest.skipIf(torch is None, "torch is not installed")
+class CTCGreedyDecodeTest(unittest.TestCase):
+    def setUp(self):
+        # The stub head treats the encoder output as the logits themselves.
+        self.model = types.SimpleNamespace(
+            head=lambda encoder_output: encoder_output,
+            decoding=types.SimpleNamespace(blank_id=BLANK_ID, tokenizer=_Tokenizer()),
+        )
+
+    def test_padded_frames_never_emit(self):
+        logits = torch.stack(
+            [
+                _one_hot([0, 0, BLANK_ID, 0, 1, 2]),
+                _one_hot([1, 1, 2, 2, 2, 2]),
+                _one_hot([2, 2, 2, 2, 2, 2]),
+            ]
+        )
+        lengths = torch.tensor([4, 3, 0])
+        self.assertEqual(
+            ctc_greedy_decode(self.model, logits, lengths), ["0,0", "1,2", ""]
+        )
+
+    def test_full_length_collapses_repeats(self):
+        logits = _one_hot([0, 0, 1, BLANK_ID, 1, 2])[None]
+        self.assertEqual(
+            ctc_greedy_decode(self.model, logits, torch.tensor([6])), ["0,1,1,2"]
+        )
+
+
+def _segment_waveform(model, audio, args):
+    """Split a stub waveform, a list of ``(name, length)`` pairs, into chunks."""
+    if audio == "bad vad":
+        raise ValueError("segmentation failed")
+    segments = [torch.zeros(length) for _, length in audio]
+    for segment, (name, _) in zip(segments, audio):
+        segment.label = name
+    boundaries = [(float(i), float(i + 1)) for i in range(len(audio))]
+    return segments, boundaries
+
+
+def _encode_segments(model, segments, lengths):
+    model.batches.append([segment.label for segment in segments])
+    if any(segment.label == "poison" for segment in segments):
+        raise RuntimeError("out of memory")
+    return segments, lengths
+
+
+def _decode_segments(model, encoded, lengths):
+    return [segment.label for segment in encoded]
+
+
+@unittest.skipIf(torch is None, "torch is not installed")
+class BatchSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        patches = [
+            mock.patch.object(transcribe, "segment_waveform", _segment_waveform),
+            mock.patch.object(
+                transcribe, "prepare_segments", lambda model, segments: (segments, None)
+            ),
+            mock.patch.object(transcribe, "encode_segments", _encode_segments),
+            mock.patch.object(transcribe, "decode_segments", _decode_segments),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.model = types.SimpleNamespace(batches=[])
+
+    def _run(self, audios, batch_size=2):
+        args = argparse.Namespace(batch_size=batch_size)
+        paths = [f"{index}.wav" for index in range(len(audios))]
+        results = []
+        for segments in transcribe_batch(self.model, paths, audios, args):
+            try:
+                results.append(
+                    [(s["transcription"], s["boundaries"]) for s in segments]
+                )
+            except Exception as exc:  # pylint: disable=broad-except
+                results.append(exc)
+        return results
+
+    def test_results_are_per_file_and_in_order(self):
+        audios = [
+            [("a0", 50), ("a1", 5), ("a2", 40)],
+            [],
+            [("b0", 6), ("b1", 45)],
+            [("c0", 7)],
+        ]
+        results = self._run(audios)
+        self.assertEqual(
+            results,
+            [
+                [("a0", (0.0, 1.0)), ("a1", (1.0, 2.0)), ("a2", (2.0, 3.0))],
+                [],
+                [("b0", (0.0, 1.0)), ("b1", (1.0, 2.0))],
+                [("c0", (0.0, 1.0))],
+            ],
+        )
+        # Chunks of similar length share a batch across files.
+        self.assertIn(["a1", "b0"], self.model.batches)
+        self.assertIn(["a0", "b1"], self.model.batches)
+
+    def test_decode_and_segmentation_errors_stay_with_their_file(self):
+        decode_error = OSError("cannot decode")
+        results = self._run(
+            [[("a0", 5)], decode_error, "bad vad", [("d0", 5), ("d1", 6)]]
+        )
+        self.assertEqual(results[0], [("a0", (0.0, 1.0))])
+        self.assertIs(results[1], decode_error)
+        self.assertIsInstance(results[2], ValueError)
+        self.assertEqual(results[3], [("d0", (0.0, 1.0)), ("d1", (1.0, 2.0))])
+
+    def test_failed_shared_batch_is_retried_per_file(self):
+        results = self._run([[("a0", 5)], [("poison", 5)], [("c0", 5)]], batch_size=3)
+        self.assertEqual(results[0], [("a0", (0.0, 1.0))])
+        self.assertIsInstance(results[1], RuntimeError)
+        self.assertEqual(results[2], [("c0", (0.0, 1.0))])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""Batched RNN-T decoders must match gigaam's per-utterance greedy search."""
+import types
+import unittest
+
+try:
+    import torch
+    from torch import nn
+except ImportError:  # pragma: no cover - torch is optional for these tests
+    torch = None
+
+from transcribe import FrameSyncRNNTDecoding, LabelLoopingRNNTDecoding
+
+VOCAB_SIZE = 6
+BLANK_ID = VOCAB_SIZE - 1
+ENC_HIDDEN = 8
+PRED_HIDDEN = 16
+
+
+class _Tokenizer:
+    def decode(self, tokens):
+        return ",".join(map(str, tokens))
+
+
+if torch is not None:
+
+    class _Decoder(nn.Module):
+        """Prediction network laid out like gigaam's ``RNNTDecoder``."""
+
+        def __init__(self):
+            super().__init__()
+            self.embed = nn.Embedding(VOCAB_SIZE, PRED_HIDDEN, padding_idx=BLANK_ID)
+            self.lstm = nn.LSTM(PRED_HIDDEN, PRED_HIDDEN, 1)
+
+        def predict(self, x, state):
+            if x is None:
+                emb = torch.zeros((1, 1, PRED_HIDDEN))
+            else:
+                emb = self.embed(x)
+            g, hidden = self.lstm(emb.transpose(0, 1), state)
+            return g.transpose(0, 1), hidden
+
+    class _Joint(nn.Module):
+        """Joint network laid out like gigaam's ``RNNTJoint``."""
+
+        def __init__(self):
+            super().__init__()
+            self.enc = nn.Linear(ENC_HIDDEN, PRED_HIDDEN)
+            self.pred = nn.Linear(PRED_HIDDEN, PRED_HIDDEN)
+            self.joint_net = nn.Sequential(
+                nn.ReLU(), nn.Linear(PRED_HIDDEN, VOCAB_SIZE)
+            )
+
+        def joint(self, encoder_out, decoder_out):
+            enc = self.enc(encoder_out).unsqueeze(2)
+            pred = self.pred(decoder_out).unsqueeze(1)
+            return self.joint_net(enc + pred).log_softmax(-1)
+
+    class _Head(nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.decoder = _Decoder()
+            self.joint = _Joint()
+
+
+def _reference_decode(head, encoded, length, max_symbols):
+    """gigaam's ``RNNTGreedyDecoding._greedy_decode`` for one utterance."""
+    hyp = []
+    state = None
+    last_label = None
+    for frame in range(length):
+        enc_out = encoded[:, frame][None, None, :]
+        for _ in range(max_symbols):
+            dec_out, hidden = head.decoder.predict(last_label, state)
+            label = head.joint.joint(enc_out, dec_out)[0, 0, 0, :].argmax(0).item()
+            if label == BLANK_ID:
+                break
+            hyp.append(label)
+            state = hidden
+            last_label = torch.tensor([[label]])
+    return _Tokenizer().decode(hyp)
+
+
+@unittest.skipIf(torch is None, "torch is not installed")
+class BatchedRNNTDecodingTest(unittest.TestCase):
+    def assert_matches_reference(self, decoding_class, max_symbols):
+        greedy = types.SimpleNamespace(
+            tokenizer=_Tokenizer(), blank_id=BLANK_ID, max_symbols=max_symbols
+        )
+        decoding = decoding_class(greedy)
+        for seed in range(10):
+            torch.manual_seed(seed)
+            head = _Head().eval()
+            with torch.no_grad():
+                # Favour blank a little so hypotheses are neither empty nor capped.
+                head.joint.joint_net[1].bias[BLANK_ID] += 1.2
+            encoded = torch.randn(5, ENC_HIDDEN, 30) * 6
+            lengths = torch.tensor([30, 0, 17, 1, 24])
+            with torch.inference_mode():
+                results = decoding.decode(head, encoded, lengths)
+                expected = [
+                    _reference_decode(head, encoded[index], int(length), max_symbols)
+                    for index, length in enumerate(lengths)
+                ]
+            self.assertEqual(results, expected, f"seed {seed}")
+
+    def test_label_looping_matches_greedy(self):
+        self.assert_matches_reference(LabelLoopingRNNTDecoding, max_symbols=3)
+
+    def test_label_looping_symbol_cap(self):
+        self.assert_matches_reference(LabelLoopingRNNTDecoding, max_symbols=1)
+
+    def test_frame_sync_matches_greedy(self):
+        self.assert_matches_reference(FrameSyncRNNTDecoding, max_symbols=3)
+
+    def test_frame_sync_symbol_cap(self):
+        self.assert_matches_reference(FrameSyncRNNTDecoding, max_symbols=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
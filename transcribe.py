@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 """Command-line tool to transcribe long Russian audio files into SRT subtitles using GigaAM.
 
-This script relies on GigaAM's ``transcribe_longform`` method which performs voice
-activity detection and chunking internally. It supports hours long audio files and
-produces a standard ``.srt`` subtitle file.
+Each file is decoded to 16 kHz mono PCM in memory with ffmpeg and split into speech
+chunks by ``segment_waveform`` using GigaAM's pyannote voice activity detection.
+Chunks from several files are transcribed together in padded batches, so hours long
+audio files are handled and each one produces a standard ``.srt`` subtitle file.
 
 Example:
     python transcribe.py input1.mp3 input2.mp3 --hf-token YOUR_HF_TOKEN
@@ -16,16 +17,31 @@ For drag-and-drop GUI mode:
     pip install tkinterdnd2
 """
 import argparse
+import concurrent.futures
+import contextlib
+import copy
+import functools
+import itertools
 import logging
+import math
 import os
 import queue
-import shutil
-import subprocess
-import tempfile
+import sys
 import threading
-from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, TYPE_CHECKING
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+)
 
 if TYPE_CHECKING:  # pragma: no cover - imported for typing only
+    import numpy as np
     from gigaam import GigaAMModel  # type: ignore
 else:
     GigaAMModel = Any  # type: ignore
@@ -33,51 +49,271 @@ else:
 
 LOGGER = logging.getLogger(__name__)
 
+SAMPLE_RATE = 16000
+
+
+@functools.lru_cache(maxsize=None)
+def _which(executable: str) -> Optional[str]:
+    """Cached ``shutil.which`` so batch runs scan ``PATH`` only once per tool."""
+    import shutil
+
+    return shutil.which(executable)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_gigaam() -> Any:
+    """Import ``gigaam`` (and torch with it) on first use only."""
+    try:
+        import gigaam  # type: ignore
+    except ModuleNotFoundError as exc:
+        raise RuntimeError(
+            "The 'gigaam' package is required. Install it with "
+            "'pip install gigaam[longform]'."
+        ) from exc
+    return gigaam
+
+
+# Zero-padded renderings of every two- and three-digit field value.
+_PAD2 = [f"{value:02}" for value in range(100)]
+_PAD3 = [f"{value:03}" for value in range(1000)]
+
 
 def format_srt_timestamp(seconds: float) -> str:
     """Format seconds to ``HH:MM:SS,mmm`` required by SRT."""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    milliseconds = int(round((seconds - int(seconds)) * 1000))
-    return f"{hours:02}:{minutes:02}:{secs:02},{milliseconds:03}"
+    hours, milliseconds = divmod(int(round(seconds * 1000)), 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    secs, milliseconds = divmod(milliseconds, 1000)
+    hours_text = _PAD2[hours] if hours < 100 else str(hours)
+    return f"{hours_text}:{_PAD2[minutes]}:{_PAD2[secs]},{_PAD3[milliseconds]}"
+
+
+def _iov_max() -> int:
+    """Return the limit on buffers per ``os.writev`` call, or 1024 if unknown."""
+    try:
+        limit = os.sysconf("SC_IOV_MAX")
+    except (AttributeError, ValueError, OSError):
+        return 1024
+    # sysconf reports -1 when the limit is indeterminate.
+    return limit if limit > 0 else 1024
+
+
+# Upper bound on the buffers passed to a single ``os.writev`` call.
+_IOV_MAX = _iov_max()
+
+
+def _write_chunks(fd: int, chunks: List[bytes]) -> None:
+    """Write ``chunks`` to ``fd`` with as few system calls as possible.
+
+    Uses ``os.writev`` where available so the chunks are not concatenated
+    first, and retries after short writes.
+    """
+    if not hasattr(os, "writev"):
+        data = memoryview(b"".join(chunks))
+        while data:
+            data = data[os.write(fd, data) :]
+        return
+    buffers = [memoryview(chunk) for chunk in chunks]
+    start = 0
+    while start < len(buffers):
+        written = os.writev(fd, buffers[start : start + _IOV_MAX])
+        while start < len(buffers) and written >= len(buffers[start]):
+            written -= len(buffers[start])
+            start += 1
+        if written:
+            buffers[start] = buffers[start][written:]
 
 
 def write_srt(
-    segments: List[Dict[str, Tuple[float, float]]], output_path: str
+    segments: Iterable[Dict[str, Any]], output_path: str
 ) -> None:
-    """Write transcription segments into an SRT file."""
-    with open(output_path, "w", encoding="utf-8") as srt_file:
-        for idx, seg in enumerate(segments, start=1):
-            start, end = seg["boundaries"]
-            transcription = seg["transcription"]
-            srt_file.write(f"{idx}\n")
-            srt_file.write(
-                f"{format_srt_timestamp(start)} --> {format_srt_timestamp(end)}\n"
-            )
-            srt_file.write(f"{transcription}\n\n")
+    """Write transcription segments into an SRT file.
+
+    ``segments`` may be a lazy iterable: entries are encoded as they arrive and
+    written in vectored batches to a ``.part`` file that replaces
+    ``output_path`` once the iterable is exhausted, so a failure midway never
+    leaves a truncated subtitle behind. Lines end with ``os.linesep``, as they
+    would in a file written in text mode.
+    """
+    partial_path = output_path + ".part"
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(partial_path, flags, 0o644)
+    try:
+        try:
+            fmt = format_srt_timestamp
+            newline = os.linesep
+            numbers = itertools.count(1)
+            pending: List[bytes] = []
+            for seg in segments:
+                start, end = seg["boundaries"]
+                entry = (
+                    f"{next(numbers)}\n{fmt(start)} --> {fmt(end)}\n"
+                    f"{seg['transcription']}\n\n"
+                )
+                if newline != "\n":
+                    entry = entry.replace("\n", newline)
+                pending.append(entry.encode("utf-8"))
+                if len(pending) == _IOV_MAX:
+                    _write_chunks(fd, pending)
+                    pending = []
+            _write_chunks(fd, pending)
+        finally:
+            os.close(fd)
+    except BaseException:
+        os.remove(partial_path)
+        raise
+    os.replace(partial_path, output_path)
 
 
-def ensure_wav(path: str) -> Tuple[str, bool]:
-    """Return a WAV path for ``path`` converting with ffmpeg if needed.
+def _read_pcm_wav(path: str, sample_rate: int) -> Optional["np.ndarray"]:
+    """Read ``path`` directly if it is a mono 16-bit PCM WAV at ``sample_rate``.
 
-    Returns the path to a WAV file and a flag indicating whether the file is
-    temporary and should be deleted afterwards.
+    Returns ``None`` for anything else (including other extensions that are not
+    WAV files), so the caller falls back to ffmpeg.
     """
-    if path.lower().endswith(".wav"):
-        return path, False
-    if not shutil.which("ffmpeg"):
-        raise RuntimeError("ffmpeg is required to convert audio formats to WAV")
-    tmp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
-    tmp_path = tmp.name
-    tmp.close()
-    subprocess.run(
-        ["ffmpeg", "-y", "-i", path, tmp_path],
-        check=True,
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
-    )
-    return tmp_path, True
+    import wave
+
+    import numpy as np
+
+    try:
+        with wave.open(path, "rb") as reader:
+            if (
+                reader.getframerate() != sample_rate
+                or reader.getnchannels() != 1
+                or reader.getsampwidth() != 2
+            ):
+                return None
+            frames = reader.readframes(reader.getnframes())
+    except (OSError, EOFError, wave.Error):
+        return None
+    samples = np.frombuffer(frames, dtype="<i2").astype(np.float32)
+    samples /= 32768.0
+    return samples
+
+
+def decode_to_ndarray(path: str, sample_rate: int = SAMPLE_RATE) -> "np.ndarray":
+    """Decode ``path`` with ffmpeg into a mono float32 waveform held in memory.
+
+    The audio is resampled to ``sample_rate`` and streamed through a pipe, so no
+    temporary WAV file is written to disk. Files that already are mono 16-bit
+    PCM WAVs at ``sample_rate`` are read without starting ffmpeg.
+    """
+    import subprocess
+
+    import numpy as np
+
+    samples = _read_pcm_wav(path, sample_rate)
+    if samples is not None:
+        return samples
+    if not _which("ffmpeg"):
+        raise RuntimeError("ffmpeg is required to decode audio files")
+    command = [
+        "ffmpeg",
+        "-nostdin",
+        "-v",
+        "quiet",
+        "-i",
+        path,
+        "-f",
+        "f32le",
+        "-ar",
+        str(sample_rate),
+        "-ac",
+        "1",
+        "pipe:1",
+    ]
+    buffer = bytearray()
+    with subprocess.Popen(
+        command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    ) as proc:
+        assert proc.stdout is not None
+        for chunk in iter(lambda: proc.stdout.read(1 << 20), b""):
+            buffer += chunk
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed to decode {path}")
+    # A writable buffer lets torch wrap the samples without copying them.
+    return np.frombuffer(buffer, dtype=np.float32)
+
+
+# gigaam keeps one global VAD pipeline and moves it to the device of every
+# ``get_pipeline`` call, so replicas on several GPUs must not share it freely.
+_VAD_LOCK = threading.Lock()
+_VAD_PIPELINES: Dict[str, Any] = {}
+
+
+def _detect_speech(device: Any, waveform: Any) -> Any:
+    """Run gigaam's VAD pipeline over ``waveform`` and return its annotation.
+
+    Every device gets its own copy of the pipeline, so the model replicas run
+    VAD in parallel; ``_VAD_LOCK`` only guards loading it. The first pipeline
+    is loaded by gigaam and later devices receive a deep copy of it.
+    """
+    pipeline = _VAD_PIPELINES.get(str(device))
+    if pipeline is None:
+        with _VAD_LOCK:
+            pipeline = _VAD_PIPELINES.get(str(device))
+            if pipeline is None:
+                if _VAD_PIPELINES:
+                    loaded = next(iter(_VAD_PIPELINES.values()))
+                    pipeline = copy.deepcopy(loaded).to(device)
+                else:
+                    _load_gigaam()
+                    from gigaam.vad_utils import get_pipeline  # type: ignore
+
+                    pipeline = get_pipeline(device)
+                _VAD_PIPELINES[str(device)] = pipeline
+    return pipeline({"waveform": waveform.unsqueeze(0), "sample_rate": SAMPLE_RATE})
+
+
+def segment_waveform(
+    model: "GigaAMModel", audio: "np.ndarray", args: argparse.Namespace
+) -> Tuple[List[Any], List[Tuple[float, float]]]:
+    """Split ``audio`` into speech chunks with gigaam's pyannote VAD pipeline.
+
+    Uses the merging rules of gigaam's ``segment_audio``: neighbouring speech
+    regions are joined until the chunk is longer than ``args.min_duration`` and
+    followed by a pause above ``args.new_chunk_threshold``, or until the next
+    region would grow it past ``args.max_duration``. Unlike gigaam, a chunk
+    starts at its first speech region and a single region longer than
+    ``args.max_duration`` is split evenly. Returns the chunk tensors (views into
+    ``audio``) and their ``(start, end)`` boundaries in seconds.
+    """
+    import torch
+
+    waveform = torch.from_numpy(audio)
+    speech = _detect_speech(model._device, waveform)  # pylint: disable=protected-access
+    total_duration = waveform.shape[-1] / SAMPLE_RATE
+
+    segments: List[Any] = []
+    boundaries: List[Tuple[float, float]] = []
+
+    def add_chunk(start: float, end: float) -> None:
+        pieces = max(1, math.ceil((end - start) / args.max_duration))
+        step = (end - start) / pieces
+        for piece in range(pieces):
+            piece_start = start + piece * step
+            piece_end = piece_start + step
+            segments.append(
+                waveform[int(piece_start * SAMPLE_RATE) : int(piece_end * SAMPLE_RATE)]
+            )
+            boundaries.append((piece_start, piece_end))
+
+    chunk_start: Optional[float] = None
+    chunk_end = 0.0
+    for region in speech.get_timeline().support():
+        start = max(0.0, region.start)
+        end = min(total_duration, region.end)
+        if chunk_start is None:
+            chunk_start = start
+        elif (
+            chunk_end - chunk_start > args.min_duration
+            and start - chunk_end > args.new_chunk_threshold
+        ) or end - chunk_start > args.max_duration:
+            add_chunk(chunk_start, chunk_end)
+            chunk_start = start
+        chunk_end = end
+    if chunk_start is not None and chunk_end > chunk_start:
+        add_chunk(chunk_start, chunk_end)
+    return segments, boundaries
 
 
 MEDIA_EXTENSIONS = {
@@ -101,22 +337,196 @@ def is_media_file(path: str) -> bool:
     return os.path.splitext(path)[1].lower() in MEDIA_EXTENSIONS
 
 
+def _stem_key(stem: str) -> str:
+    """Normalise ``stem`` for comparisons on case-insensitive filesystems.
+
+    ``os.path.normcase`` folds case on Windows only; macOS volumes are
+    case-insensitive by default, so stems are folded there as well.
+    """
+    stem = os.path.normcase(stem)
+    return stem.lower() if sys.platform == "darwin" else stem
+
+
 def has_adjacent_srt(path: str) -> bool:
-    return os.path.exists(os.path.splitext(path)[0] + ".srt")
+    """Return whether subtitles for ``path`` already exist next to it.
+
+    Follows the rule of the directory scan in :func:`collect_media_paths`: a
+    ``.srt`` file in any case whose stem matches under :func:`_stem_key`.
+    """
+    stem = os.path.splitext(path)[0]
+    if os.path.exists(stem + ".srt"):
+        return True
+    directory = os.path.dirname(path) or os.curdir
+    key = _stem_key(os.path.join(directory, os.path.basename(stem)))
+    try:
+        entries = list(_iter_directory_files(directory, recursive=False))
+    except OSError:
+        return False
+    return any(
+        ext.lower() == ".srt" and _stem_key(other) == key for _, other, ext in entries
+    )
+
+
+def probe_duration(path: str) -> float:
+    """Return the duration of ``path`` in seconds, or ``0.0`` if unknown.
+
+    WAV files are measured from their header; anything else asks ffprobe.
+    """
+    import subprocess
+    import wave
+
+    try:
+        with wave.open(path, "rb") as reader:
+            return reader.getnframes() / reader.getframerate()
+    except (OSError, EOFError, wave.Error, ZeroDivisionError):
+        pass
+    if not _which("ffprobe"):
+        return 0.0
+    result = subprocess.run(
+        [
+            "ffprobe",
+            "-v",
+            "error",
+            "-show_entries",
+            "format=duration",
+            "-of",
+            "csv=p=0",
+            path,
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        return 0.0
+
+
+def probe_durations(paths: List[str], max_workers: int = 16) -> List[float]:
+    """Return :func:`probe_duration` of every path, probing them concurrently."""
+    if len(paths) < 2:
+        return [probe_duration(path) for path in paths]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(probe_duration, paths))
+
+
+NETWORK_FILESYSTEMS = {
+    "9p",
+    "afs",
+    "ceph",
+    "cifs",
+    "davfs",
+    "fuse.glusterfs",
+    "fuse.rclone",
+    "fuse.sshfs",
+    "glusterfs",
+    "ncpfs",
+    "nfs",
+    "nfs4",
+    "smb3",
+    "smbfs",
+    "sshfs",
+}
+
+
+def _is_network_path(path: str) -> bool:
+    """Best-effort check whether ``path`` lives on a network filesystem."""
+    path = os.path.realpath(path)
+    if os.name == "nt":
+        if path.startswith("\\\\"):
+            return True
+        import ctypes
+
+        drive = os.path.splitdrive(path)[0] + "\\"
+        return ctypes.windll.kernel32.GetDriveTypeW(drive) == 4  # DRIVE_REMOTE
+    try:
+        with open("/proc/self/mounts", encoding="utf-8") as mounts:
+            entries = [line.split()[1:3] for line in mounts]
+    except OSError:
+        return False
+    best_mount, best_type = "", ""
+    for mount_point, fs_type in entries:
+        mount_point = mount_point.replace("\\040", " ")
+        prefix = mount_point.rstrip("/") + "/"
+        if (path == mount_point or path.startswith(prefix)) and len(
+            mount_point
+        ) > len(best_mount):
+            best_mount, best_type = mount_point, fs_type
+    return best_type in NETWORK_FILESYSTEMS
+
+
+def _scan_directory(directory: str) -> Tuple[List[str], List[str]]:
+    """Return the files and subdirectories of ``directory`` (like ``os.walk``)."""
+    files: List[str] = []
+    subdirs: List[str] = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    files.append(entry.path)
+                elif not entry.is_symlink():
+                    subdirs.append(entry.path)
+    except OSError:
+        pass
+    return files, subdirs
+
+
+def _walk_parallel(directory: str, max_workers: int = 32) -> Iterator[str]:
+    """Yield every file below ``directory``, listing directories concurrently.
+
+    Each listing is a round-trip on network filesystems, so the tree is walked
+    breadth-first with up to ``max_workers`` ``scandir`` calls in flight.
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {executor.submit(_scan_directory, directory)}
+        while pending:
+            done, pending = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                files, subdirs = future.result()
+                pending.update(
+                    executor.submit(_scan_directory, subdir) for subdir in subdirs
+                )
+                yield from files
 
 
-def _iter_directory_files(directory: str, recursive: bool) -> Iterator[str]:
+def _iter_directory_files(
+    directory: str, recursive: bool
+) -> Iterator[Tuple[str, str, str]]:
+    """Yield ``(path, stem, extension)`` for files below ``directory``.
+
+    ``stem`` is the path without its extension, so it also identifies the
+    directory a file lives in. Recursive scans of network mounts list
+    directories in parallel.
+    """
     if recursive:
-        for root, _, files in os.walk(directory):
-            for name in files:
-                yield os.path.join(root, name)
+        if _is_network_path(directory):
+            LOGGER.info("%s is on a network mount, scanning in parallel", directory)
+            paths: Iterable[str] = _walk_parallel(directory)
+        else:
+            paths = (
+                os.path.join(root, name)
+                for root, _, files in os.walk(directory)
+                for name in files
+            )
+        for path in paths:
+            yield (path, *os.path.splitext(path))
     else:
         for entry in os.scandir(directory):
             if entry.is_file():
-                yield entry.path
+                yield (entry.path, *os.path.splitext(entry.path))
 
 
-def collect_media_paths(inputs: Iterable[str], recursive: bool) -> List[str]:
+def collect_media_paths(
+    inputs: Iterable[str], recursive: bool, probe: bool = True
+) -> List[Tuple[str, float]]:
+    """Return ``(path, duration)`` pairs for media files that still need subtitles.
+
+    Durations are only used to batch several files, so they are left at ``0.0``
+    (unknown) when ``probe`` is false or a single file was found.
+    """
     discovered: List[str] = []
     seen = set()
     for original in inputs:
@@ -128,10 +538,15 @@ def collect_media_paths(inputs: Iterable[str], recursive: bool) -> List[str]:
                 original,
                 " recursively" if recursive else "",
             )
-            for candidate in _iter_directory_files(original, recursive):
+            # Subtitles are looked up in the listing instead of one stat per file.
+            entries = list(_iter_directory_files(original, recursive))
+            srt_stems = {
+                _stem_key(stem) for _, stem, ext in entries if ext.lower() == ".srt"
+            }
+            for candidate, stem, ext in entries:
                 if "venv" in candidate:
                     continue
-                if not is_media_file(candidate) or has_adjacent_srt(candidate):
+                if ext.lower() not in MEDIA_EXTENSIONS or _stem_key(stem) in srt_stems:
                     continue
                 if candidate not in seen:
                     seen.add(candidate)
@@ -144,47 +559,717 @@ def collect_media_paths(inputs: Iterable[str], recursive: bool) -> List[str]:
         if original not in seen:
             seen.add(original)
             discovered.append(original)
-    return discovered
+    if probe and len(discovered) > 1:
+        durations = probe_durations(discovered)
+    else:
+        durations = [0.0] * len(discovered)
+    return list(zip(discovered, durations))
+
 
+def split_by_total_duration(
+    items: Iterable[Tuple[Any, float]], max_total: float
+) -> List[List[Tuple[Any, float]]]:
+    """Split ``(item, duration)`` pairs into consecutive groups of bounded length.
 
-def transcribe_audio_file(
+    A group is closed before its total duration would exceed ``max_total``. An
+    item with an unknown (non-positive) duration or one longer than
+    ``max_total`` forms a group of its own.
+    """
+    groups: List[List[Tuple[Any, float]]] = []
+    total = 0.0
+    for item in items:
+        duration = item[1]
+        if (
+            groups
+            and duration > 0
+            and groups[-1][0][1] > 0
+            and total + duration <= max_total
+        ):
+            groups[-1].append(item)
+            total += duration
+        else:
+            groups.append([item])
+            total = duration
+    return groups
+
+
+def ctc_greedy_decode(model: "GigaAMModel", encoded: Any, lengths: Any) -> List[str]:
+    """Greedy CTC decoding of a padded batch.
+
+    gigaam's ``CTCGreedyDecoding`` masks padding along the batch axis instead of
+    the time axis, which only works for single-utterance calls; here frames past
+    each utterance's length are forced to blank before collapsing repeats.
+    """
+    import torch
+
+    decoding = model.decoding
+    labels = model.head(encoder_output=encoded).argmax(dim=-1)
+    frames = torch.arange(labels.shape[1], device=labels.device)
+    labels[frames[None, :] >= lengths[:, None]] = decoding.blank_id
+    keep = labels != decoding.blank_id
+    keep[:, 1:] &= labels[:, 1:] != labels[:, :-1]
+    labels, keep = labels.cpu(), keep.cpu()
+    return [
+        decoding.tokenizer.decode(row[mask].tolist()) for row, mask in zip(labels, keep)
+    ]
+
+
+class LabelLoopingRNNTDecoding:
+    """Batched greedy RNN-T decoding with the label-looping algorithm.
+
+    gigaam's ``RNNTGreedyDecoding`` decodes a batch one utterance at a time.
+    Here all hypotheses advance together: each step runs the joint network once
+    for the whole batch, utterances that predicted blank move on to their next
+    frame in an inner loop until every active one has a label, and only then is
+    the prediction network updated for the emitting utterances. Results are
+    identical to the per-utterance greedy search.
+    """
+
+    def __init__(self, greedy: Any) -> None:
+        self.tokenizer = greedy.tokenizer
+        self.blank_id = greedy.blank_id
+        self.max_symbols = greedy.max_symbols
+
+    def _joint_argmax(self, head: Any, encoded: Any, frames: Any, dec_out: Any) -> Any:
+        import torch
+
+        batch = torch.arange(encoded.shape[0], device=encoded.device)
+        frames = frames.clamp(max=encoded.shape[1] - 1)
+        enc_out = encoded[batch, frames].unsqueeze(1)
+        return head.joint.joint(enc_out, dec_out)[:, 0, 0, :].argmax(-1)
+
+    def decode(self, head: Any, encoded: Any, enc_len: Any) -> List[str]:
+        import torch
+
+        encoded = encoded.transpose(1, 2)
+        batch_size, max_frames = encoded.shape[0], encoded.shape[1]
+        device = encoded.device
+        frames = torch.zeros(batch_size, dtype=torch.long, device=device)
+        symbols = torch.zeros_like(frames)
+        lengths = torch.zeros_like(frames)
+        transcripts = torch.zeros(
+            (batch_size, max_frames * self.max_symbols + 1),
+            dtype=torch.long,
+            device=device,
+        )
+        # The blank embedding is all zeros, the same input gigaam starts from.
+        labels = torch.full((batch_size, 1), self.blank_id, device=device)
+        dec_out, state = head.decoder.predict(labels, None)
+
+        active = frames < enc_len
+        while active.any():
+            labels = self._joint_argmax(head, encoded, frames, dec_out)
+            advance = active & (labels == self.blank_id)
+            while advance.any():
+                frames += advance
+                symbols.masked_fill_(advance, 0)
+                active = frames < enc_len
+                advance &= active
+                if not advance.any():
+                    break
+                found = self._joint_argmax(head, encoded, frames, dec_out)
+                labels = torch.where(advance, found, labels)
+                advance &= labels == self.blank_id
+
+            emit = active
+            transcripts[emit, lengths[emit]] = labels[emit]
+            lengths += emit
+            symbols += emit
+
+            labels = labels.masked_fill(~emit, self.blank_id).unsqueeze(1)
+            new_out, new_state = head.decoder.predict(labels, state)
+            dec_out = torch.where(emit[:, None, None], new_out, dec_out)
+            state = tuple(
+                torch.where(emit[None, :, None], new, old)
+                for new, old in zip(new_state, state)
+            )
+
+            exhausted = emit & (symbols >= self.max_symbols)
+            frames += exhausted
+            symbols.masked_fill_(exhausted, 0)
+            active = frames < enc_len
+
+        return self._to_text(transcripts, lengths)
+
+    def _to_text(self, transcripts: Any, lengths: Any) -> List[str]:
+        transcripts, lengths = transcripts.cpu(), lengths.cpu().tolist()
+        return [
+            self.tokenizer.decode(row[:length].tolist())
+            for row, length in zip(transcripts, lengths)
+        ]
+
+
+class FrameSyncRNNTDecoding(LabelLoopingRNNTDecoding):
+    """Batched greedy RNN-T decoding with the whole batch in lockstep over time.
+
+    Every step looks at the same frame of every utterance. Utterances that
+    predicted blank (or reached ``max_symbols``) wait until the rest of the
+    batch is done with the frame, then all of them advance together. This is
+    the "inexact" batched search of multi-blank transducers, where the batch
+    moves by the shortest predicted blank duration; GigaAM's transducer only
+    has the one-frame blank, so the batch always moves by one frame and the
+    results still match the per-utterance search. Each step reads one
+    contiguous frame slice instead of gathering a frame per utterance, at the
+    cost of running the joint for utterances that are waiting.
+    """
+
+    def decode(self, head: Any, encoded: Any, enc_len: Any) -> List[str]:
+        import torch
+
+        encoded = encoded.transpose(1, 2)
+        batch_size, max_frames = encoded.shape[0], encoded.shape[1]
+        device = encoded.device
+        lengths = torch.zeros(batch_size, dtype=torch.long, device=device)
+        transcripts = torch.zeros(
+            (batch_size, max_frames * self.max_symbols + 1),
+            dtype=torch.long,
+            device=device,
+        )
+        labels = torch.full((batch_size, 1), self.blank_id, device=device)
+        dec_out, state = head.decoder.predict(labels, None)
+
+        for frame in range(int(enc_len.max())):
+            enc_out = encoded[:, frame : frame + 1]
+            emit = frame < enc_len
+            for _ in range(self.max_symbols):
+                labels = head.joint.joint(enc_out, dec_out)[:, 0, 0, :].argmax(-1)
+                emit &= labels != self.blank_id
+                if not emit.any():
+                    break
+                transcripts[emit, lengths[emit]] = labels[emit]
+                lengths += emit
+
+                labels = labels.masked_fill(~emit, self.blank_id).unsqueeze(1)
+                new_out, new_state = head.decoder.predict(labels, state)
+                dec_out = torch.where(emit[:, None, None], new_out, dec_out)
+                state = tuple(
+                    torch.where(emit[None, :, None], new, old)
+                    for new, old in zip(new_state, state)
+                )
+
+        return self._to_text(transcripts, lengths)
+
+
+@functools.lru_cache(maxsize=None)
+def _copy_stream(device: Any) -> Any:
+    """Side CUDA stream used for host-to-device copies on ``device``."""
+    import torch
+
+    return torch.cuda.Stream(device)
+
+
+@contextlib.contextmanager
+def _inference_context(model: "GigaAMModel") -> Iterator[None]:
+    """Inference mode plus autocast in the precision of the model's encoder."""
+    import torch
+
+    encoder_dtype = next(model.encoder.parameters()).dtype
+    with torch.inference_mode(), torch.autocast(
+        device_type=model._device.type,  # pylint: disable=protected-access
+        dtype=encoder_dtype,
+        enabled=encoder_dtype != torch.float32,
+    ):
+        yield
+
+
+def prepare_segments(model: "GigaAMModel", segments: List[Any]) -> Tuple[Any, Any]:
+    """Pad ``segments`` into a ``[B, T]`` batch and move it to the model's device.
+
+    ``segments`` are 1-D waveform tensors sampled at ``SAMPLE_RATE``; they are
+    right-padded to the longest one. For a compiled encoder the padding is
+    rounded up to whole seconds, which bounds the number of distinct shapes it
+    has to be specialised for. On CUDA the batch is assembled in pinned memory
+    and copied asynchronously on a side stream, so the transfer overlaps with
+    whatever the GPU is still computing; :func:`encode_segments` waits for it.
+    """
+    import torch
+
+    device = model._device  # pylint: disable=protected-access
+    on_cuda = device.type == "cuda"
+    lengths = torch.tensor([seg.shape[-1] for seg in segments])
+    width = int(lengths.max())
+    if hasattr(model.encoder, "_orig_mod"):
+        width += -width % SAMPLE_RATE
+    wav = torch.zeros((len(segments), width), pin_memory=on_cuda)
+    for row, segment in zip(wav, segments):
+        row[: segment.shape[-1]] = segment
+    if not on_cuda:
+        return wav.to(device), lengths.to(device)
+    with torch.cuda.stream(_copy_stream(device)):
+        return (
+            wav.to(device, non_blocking=True),
+            lengths.pin_memory().to(device, non_blocking=True),
+        )
+
+
+def encode_segments(model: "GigaAMModel", wav: Any, lengths: Any) -> Tuple[Any, Any]:
+    """Run the preprocessor and encoder over a batch from :func:`prepare_segments`.
+
+    Features are computed in float32 and the encoder runs under autocast in
+    whatever precision :func:`load_asr_model` cast it to. The kernels are only
+    queued, so the caller can prepare the next batch while they run.
+    """
+    import torch
+
+    device = model._device  # pylint: disable=protected-access
+    if device.type == "cuda":
+        current = torch.cuda.current_stream(device)
+        current.wait_stream(_copy_stream(device))
+        wav.record_stream(current)
+        lengths.record_stream(current)
+    encoder_dtype = next(model.encoder.parameters()).dtype
+    with _inference_context(model):
+        features, feature_lengths = model.preprocessor(wav, lengths)
+        return model.encoder(features.to(encoder_dtype), feature_lengths)
+
+
+def decode_segments(model: "GigaAMModel", encoded: Any, encoded_len: Any) -> List[str]:
+    """Turn the encoder output of a batch into transcripts.
+
+    The head and decoder stay in float32, so the encoder output is upcast and
+    decoded without autocast; only the encoder runs in reduced precision.
+    """
+    import torch
+
+    with torch.inference_mode():
+        encoded = encoded.float()
+        if hasattr(model.head, "decoder_layers"):  # CTC head
+            return ctc_greedy_decode(model, encoded, encoded_len)
+        return model.decoding.decode(model.head, encoded, encoded_len)
+
+
+def transcribe_segments(model: "GigaAMModel", segments: List[Any]) -> List[str]:
+    """Run a single batched forward pass over ``segments`` and decode them."""
+    return decode_segments(
+        model, *encode_segments(model, *prepare_segments(model, segments))
+    )
+
+
+class _Chunk(NamedTuple):
+    index: int
+    position: int
+    bounds: Tuple[float, float]
+    segment: Any
+
+
+# Number of batches' worth of chunks the scheduler looks ahead to sort by length.
+_LOOKAHEAD_BATCHES = 4
+
+
+class _BatchScheduler:
+    """Transcribe the VAD chunks of several files lazily, in shared batches.
+
+    Chunks are read in file order into a look-ahead window of a few batches.
+    Each batch takes the oldest chunk of the window together with the chunks
+    closest to it in length, so batches are padded little while every file
+    keeps making progress. Results are buffered per file and handed out in
+    chunk order as its generator consumes them. The next batch is assembled
+    and copied to the device while the encoder works on the current one. If a
+    batch shared by several files fails, it is run again one file at a time,
+    so an error only fails the file that caused it. Once ``stop_event`` is
+    set, no further batch is started and the generators raise.
+    """
+
+    def __init__(
+        self,
+        model: "GigaAMModel",
+        audios: List[Any],
+        args: argparse.Namespace,
+        stop_event: Optional[threading.Event] = None,
+    ) -> None:
+        self.model = model
+        self.args = args
+        self.stop_event = stop_event
+        self.chunks = self._iter_chunks(audios)
+        self.window: List[_Chunk] = []
+        self.ready: List[Dict[int, Dict[str, Any]]] = [{} for _ in audios]
+        self.consumed = [0] * len(audios)
+        self.counts: List[Optional[int]] = [None] * len(audios)
+        self.errors: List[Optional[Exception]] = [None] * len(audios)
+        self.upcoming: Optional[Tuple[List[_Chunk], Any]] = None
+
+    def _iter_chunks(self, audios: List[Any]) -> Iterator[Any]:
+        """Yield the :class:`_Chunk` objects of every file, then an end marker.
+
+        The end marker is an ``(index, count, error)`` tuple carrying the
+        number of chunks of the file and ``None``, or the exception raised
+        while decoding or segmenting it.
+        """
+        for index, audio in enumerate(audios):
+            try:
+                if isinstance(audio, Exception):
+                    raise audio
+                segments, boundaries = segment_waveform(self.model, audio, self.args)
+            except Exception as exc:  # pylint: disable=broad-except
+                yield index, 0, exc
+                continue
+            for position, (segment, bounds) in enumerate(zip(segments, boundaries)):
+                yield _Chunk(index, position, bounds, segment)
+            yield index, len(segments), None
+
+    def _fail(self, index: int, exc: Exception) -> None:
+        if self.errors[index] is None:
+            self.errors[index] = exc
+
+    def _take_batch(self) -> List[_Chunk]:
+        """Remove the next batch of chunks from the look-ahead window."""
+        while len(self.window) < self.args.batch_size * _LOOKAHEAD_BATCHES:
+            item = next(self.chunks, None)
+            if item is None:
+                break
+            if isinstance(item, _Chunk):
+                self.window.append(item)
+                continue
+            index, count, error = item
+            self.counts[index] = count
+            if error is not None:
+                self._fail(index, error)
+        window = [chunk for chunk in self.window if self.errors[chunk.index] is None]
+        if not window:
+            self.window = []
+            return []
+        # Start at the oldest chunk and take its neighbours in length order.
+        order = sorted(range(len(window)), key=lambda i: window[i].segment.shape[-1])
+        start = max(0, min(order.index(0), len(order) - self.args.batch_size))
+        taken = set(order[start : start + self.args.batch_size])
+        self.window = [chunk for i, chunk in enumerate(window) if i not in taken]
+        return [window[i] for i in sorted(taken)]
+
+    def _prepare_next(self) -> Tuple[List[_Chunk], Any]:
+        """Take the next batch of chunks and start moving it to the device.
+
+        Returns the batch and the prepared tensors (or the exception raised
+        while preparing them).
+        """
+        batch = self._take_batch()
+        prepared: Any = None
+        if batch:
+            try:
+                prepared = prepare_segments(
+                    self.model, [chunk.segment for chunk in batch]
+                )
+            except Exception as exc:  # pylint: disable=broad-except
+                prepared = exc
+        return batch, prepared
+
+    def _run_batch(self) -> None:
+        batch, prepared = self.upcoming or self._prepare_next()
+        self.upcoming = None
+        if not batch:
+            return
+        try:
+            if isinstance(prepared, Exception):
+                raise prepared
+            encoded = encode_segments(self.model, *prepared)
+            self.upcoming = self._prepare_next()
+            texts = decode_segments(self.model, *encoded)
+        except Exception as exc:  # pylint: disable=broad-except
+            self._retry_by_file(batch, exc)
+        else:
+            self._store(batch, texts)
+
+    def _store(self, chunks: List[_Chunk], texts: List[str]) -> None:
+        for chunk, text in zip(chunks, texts):
+            self.ready[chunk.index][chunk.position] = {
+                "transcription": text,
+                "boundaries": chunk.bounds,
+            }
+
+    def _retry_by_file(self, batch: List[_Chunk], exc: Exception) -> None:
+        """Re-run a failed batch one file at a time so only the culprit fails."""
+        by_file: Dict[int, List[_Chunk]] = {}
+        for chunk in batch:
+            by_file.setdefault(chunk.index, []).append(chunk)
+        if len(by_file) == 1:
+            self._fail(batch[0].index, exc)
+            return
+        for index, chunks in by_file.items():
+            try:
+                texts = transcribe_segments(
+                    self.model, [chunk.segment for chunk in chunks]
+                )
+            except Exception as file_exc:  # pylint: disable=broad-except
+                self._fail(index, file_exc)
+            else:
+                self._store(chunks, texts)
+
+    def segments(self, index: int) -> Iterator[Dict[str, Any]]:
+        """Yield the transcribed segments of file ``index`` in order."""
+        ready = self.ready[index]
+        while True:
+            error = self.errors[index]
+            if error is not None:
+                raise error
+            position = self.consumed[index]
+            if position in ready:
+                self.consumed[index] = position + 1
+                yield ready.pop(position)
+            elif self.counts[index] == position:
+                return
+            elif self.stop_event is not None and self.stop_event.is_set():
+                raise RuntimeError("Transcription was stopped")
+            else:
+                self._run_batch()
+
+
+def transcribe_batch(
     model: "GigaAMModel",
-    audio_path: str,
+    audio_paths: List[str],
+    audios: List[Any],
     args: argparse.Namespace,
-    output_override: Optional[str] = None,
-) -> Optional[str]:
-    """Transcribe a single ``audio_path`` and return the output SRT path."""
+    stop_event: Optional[threading.Event] = None,
+) -> List[Iterator[Dict[str, Any]]]:
+    """Transcribe ``audio_paths`` together, batching VAD chunks across files.
+
+    ``audios`` holds the decoded waveform of every path, or the exception raised
+    while decoding it. Returns one lazy segment generator per input (in input
+    order); chunks are decoded ``args.batch_size`` at a time as the generators
+    are consumed, and a generator raises if its file could not be transcribed.
+    Consuming the generators in order keeps a few batches of chunks in memory.
+    Setting ``stop_event`` makes the generators raise before the next batch.
+    """
+    scheduler = _BatchScheduler(model, audios, args, stop_event)
+    return [scheduler.segments(index) for index in range(len(audio_paths))]
+
+
+def _put_until_stopped(
+    out_queue: "queue.Queue[Any]", item: Any, stop_event: threading.Event
+) -> bool:
+    """Put ``item`` into ``out_queue`` unless ``stop_event`` is set meanwhile."""
+    while not stop_event.is_set():
+        try:
+            out_queue.put(item, timeout=0.1)
+        except queue.Full:
+            continue
+        return True
+    return False
+
 
-    LOGGER.info("Processing %s", audio_path)
-    wav_path, is_temp = ensure_wav(audio_path)
+def _decode_or_error(audio_path: str) -> Any:
     try:
-        segments = model.transcribe_longform(
-            wav_path,
-            max_duration=args.max_duration,
-            min_duration=args.min_duration,
-            new_chunk_threshold=args.new_chunk_threshold,
-        )
+        return decode_to_ndarray(audio_path)
     except Exception as exc:  # pylint: disable=broad-except
-        if args.ignore_errors:
-            LOGGER.error("Transcription failed for %s: %s", audio_path, exc)
-            return None
-        raise
-    finally:
-        if is_temp:
-            os.remove(wav_path)
+        return exc
+
+
+class _Job(NamedTuple):
+    audio_path: str
+    output_path: str
+    duration: float
+    future: "concurrent.futures.Future[str]"
 
-    output_path = output_override or os.path.splitext(audio_path)[0] + ".srt"
-    write_srt(segments, output_path)
-    LOGGER.info("Saved subtitles to %s", output_path)
-    return output_path
+
+def _total_duration(jobs: List[_Job]) -> float:
+    """Total duration of ``jobs``, or infinity if any of them is unknown."""
+    if any(job.duration <= 0 for job in jobs):
+        return math.inf
+    return sum(job.duration for job in jobs)
+
+
+class TranscriptionService:
+    """Keep ``models`` loaded and transcribe submitted files in the background.
+
+    The CLI, the GUI and ``--serve`` all go through one service. Submitted
+    files are grouped into batches of at most ``args.decode_batch_minutes`` of
+    audio, decoded by a background thread (up to ``args.decode_workers`` ffmpeg
+    processes at once) while earlier batches are transcribed by one thread per
+    model, so each GPU runs one batch at a time and replicas on several GPUs
+    share the work. Batches queued by different callers, such as concurrent
+    server clients, are merged while they fit in the same limit. Decoded
+    batches wait in a bounded queue, which keeps at most a couple of decoded
+    batches per model in memory.
+    """
+
+    def __init__(self, models: List["GigaAMModel"], args: argparse.Namespace) -> None:
+        self.models = models
+        self.args = args
+        self._requests: "queue.Queue[Optional[Tuple[int, List[_Job]]]]" = (
+            queue.Queue()
+        )
+        self._submissions = itertools.count()
+        self._decoded: "queue.Queue[Tuple[List[_Job], List[Any]]]" = queue.Queue(
+            maxsize=2 * len(models)
+        )
+        self._stop_event = threading.Event()
+        self._threads = [threading.Thread(target=self._decode_loop, daemon=True)]
+        self._threads.extend(
+            threading.Thread(target=self._transcribe_loop, args=(model,), daemon=True)
+            for model in models
+        )
+        for thread in self._threads:
+            thread.start()
+
+    def __enter__(self) -> "TranscriptionService":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def submit_many(
+        self,
+        media_items: List[Tuple[str, float]],
+        output_override: Optional[str] = None,
+    ) -> List["concurrent.futures.Future[str]"]:
+        """Queue ``media_items`` and return one future per item, in input order.
+
+        ``media_items`` are ``(path, duration)`` pairs as returned by
+        :func:`collect_media_paths`. Files are sorted by duration and grouped
+        so that each group holds at most ``args.decode_batch_minutes`` of
+        audio; files of unknown duration are decoded one at a time. Each future
+        resolves to the path of the written SRT file, or raises if the file
+        could not be transcribed.
+        """
+        submission = next(self._submissions)
+        jobs = [
+            _Job(
+                audio_path,
+                output_override or os.path.splitext(audio_path)[0] + ".srt",
+                duration,
+                concurrent.futures.Future(),
+            )
+            for audio_path, duration in media_items
+        ]
+        items = sorted(((job, job.duration) for job in jobs), key=lambda p: p[1])
+        max_total = self.args.decode_batch_minutes * 60
+        for batch in split_by_total_duration(items, max_total):
+            self._requests.put((submission, [job for job, _ in batch]))
+        return [job.future for job in jobs]
+
+    def submit(
+        self, audio_path: str, output_path: Optional[str] = None
+    ) -> "concurrent.futures.Future[str]":
+        """Queue a single ``audio_path``; see :meth:`submit_many`."""
+        return self.submit_many([(audio_path, 0.0)], output_path)[0]
+
+    def transcribe(self, audio_path: str, output_path: Optional[str] = None) -> str:
+        """Transcribe ``audio_path`` and return the path of the written SRT file."""
+        return self.submit(audio_path, output_path).result()
+
+    def close(self) -> None:
+        """Stop the worker threads and cancel every job that has not finished."""
+        self._stop_event.set()
+        self._requests.put(None)
+        for thread in self._threads:
+            thread.join()
+        pending: List[_Job] = []
+        while not self._requests.empty():
+            item = self._requests.get_nowait()
+            if item is not None:
+                pending.extend(item[1])
+        while not self._decoded.empty():
+            pending.extend(self._decoded.get_nowait()[0])
+        for job in pending:
+            if not job.future.cancel() and not job.future.done():
+                job.future.set_exception(
+                    RuntimeError("The transcription service was closed")
+                )
+
+    def _decode_loop(self) -> None:
+        """Decode queued batches ahead of the transcription threads.
+
+        Batches already waiting from other submissions are merged into the
+        current one while the total stays within ``args.decode_batch_minutes``;
+        batches of one submission are kept apart, as :meth:`submit_many`
+        already sized them. Decoding errors are stored in place of the waveform
+        so they are reported per file. ffmpeg runs in a subprocess, so these
+        threads do not compete with inference for the GIL.
+        """
+        max_total = self.args.decode_batch_minutes * 60
+        held: List[Any] = []
+        try:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.args.decode_workers
+            ) as executor:
+                while not self._stop_event.is_set():
+                    item = held.pop() if held else self._requests.get()
+                    if item is None:
+                        return
+                    submissions, jobs = {item[0]}, item[1]
+                    total = _total_duration(jobs)
+                    while total < max_total:
+                        try:
+                            item = self._requests.get_nowait()
+                        except queue.Empty:
+                            break
+                        if (
+                            item is None
+                            or item[0] in submissions
+                            or total + _total_duration(item[1]) > max_total
+                        ):
+                            held.append(item)
+                            break
+                        submissions.add(item[0])
+                        jobs = jobs + item[1]
+                        total += _total_duration(item[1])
+                    jobs = [
+                        job
+                        for job in jobs
+                        if job.future.set_running_or_notify_cancel()
+                    ]
+                    if not jobs:
+                        continue
+                    audios = list(
+                        executor.map(
+                            _decode_or_error, [job.audio_path for job in jobs]
+                        )
+                    )
+                    if not _put_until_stopped(
+                        self._decoded, (jobs, audios), self._stop_event
+                    ):
+                        held.append((-1, jobs))
+                        return
+        finally:
+            # Hand unprocessed batches back so ``close`` can cancel them.
+            for item in held:
+                self._requests.put(item)
+
+    def _transcribe_loop(self, model: "GigaAMModel") -> None:
+        """Transcribe decoded batches on ``model`` and write their SRT files."""
+        if self.args.compile:
+            try:
+                warm_up_model(model, self.args)
+            except Exception as exc:  # pylint: disable=broad-except
+                LOGGER.warning("Encoder warm-up failed: %s", exc)
+        while not self._stop_event.is_set():
+            try:
+                jobs, audios = self._decoded.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            try:
+                results = transcribe_batch(
+                    model,
+                    [job.audio_path for job in jobs],
+                    audios,
+                    self.args,
+                    self._stop_event,
+                )
+                for job, segments in zip(jobs, results):
+                    if self._stop_event.is_set():
+                        break
+                    LOGGER.info("Processing %s", job.audio_path)
+                    try:
+                        write_srt(segments, job.output_path)
+                    except Exception as exc:  # pylint: disable=broad-except
+                        job.future.set_exception(exc)
+                    else:
+                        LOGGER.info("Saved subtitles to %s", job.output_path)
+                        job.future.set_result(job.output_path)
+            except Exception as exc:  # pylint: disable=broad-except
+                for job in jobs:
+                    if not job.future.done():
+                        job.future.set_exception(exc)
+            for job in jobs:
+                if not job.future.done():
+                    job.future.set_exception(
+                        RuntimeError("The transcription service was closed")
+                    )
 
 
 def launch_drag_and_drop_gui(
-    model: "GigaAMModel",
-    args: argparse.Namespace,
+    service: TranscriptionService,
     initial_inputs: Optional[List[str]] = None,
 ) -> None:
-    """Launch a drag-and-drop GUI for sequential transcription."""
+    """Launch a drag-and-drop GUI that transcribes dropped files with ``service``."""
 
     try:
         import tkinter as tk
@@ -243,20 +1328,21 @@ def launch_drag_and_drop_gui(
 
     def process_inputs(inputs: List[str]) -> None:
         try:
-            collected = collect_media_paths(inputs, args.recursive)
+            collected = collect_media_paths(inputs, service.args.recursive)
         except (FileNotFoundError, ValueError) as exc:
             append_log(f"Ошибка: {exc}")
-            root.after(0, lambda: messagebox.showerror("Ошибка", str(exc)))
+            root.after(0, lambda e=exc: messagebox.showerror("Ошибка", str(e)))
             return
 
         if not collected:
             set_status("Подходящие файлы не найдены или SRT уже существует")
             return
 
-        for audio_path in collected:
+        futures = service.submit_many(collected)
+        for (audio_path, _), future in zip(collected, futures):
             set_status(f"Обработка {audio_path}")
             try:
-                output_path = transcribe_audio_file(model, audio_path, args)
+                output_path = future.result()
             except Exception as exc:  # pylint: disable=broad-except
                 append_log(f"Ошибка при обработке {audio_path}: {exc}")
                 root.after(
@@ -265,13 +1351,14 @@ def launch_drag_and_drop_gui(
                         "Ошибка транскрибации", f"{p}: {e}"
                     ),
                 )
-                if not args.ignore_errors:
+                if not service.args.ignore_errors:
+                    for pending in futures:
+                        pending.cancel()
                     break
                 continue
 
-            if output_path:
-                append_log(f"Готово: {output_path}")
-                set_status(f"Субтитры сохранены в {output_path}")
+            append_log(f"Готово: {output_path}")
+            set_status(f"Субтитры сохранены в {output_path}")
 
     def worker() -> None:
         while not stop_event.is_set():
@@ -310,18 +1397,316 @@ def launch_drag_and_drop_gui(
     worker_thread.join(timeout=1)
 
 
-def load_asr_model(model_name: str, device: Optional[str]) -> "GigaAMModel":
-    """Import required dependencies and return an initialized ASR model."""
+DEFAULT_SERVER_PORT = 50720
+
+
+def _server_address(args: argparse.Namespace) -> Tuple[int, Any]:
+    """Return the socket family and address used by ``--serve``/``--client``.
+
+    A UNIX socket is used where available, a loopback TCP port otherwise. The
+    default socket lives in the user's ``XDG_RUNTIME_DIR``, or carries the uid
+    in its name in the shared temp directory, so users never share a server.
+    """
+    import socket
+    import tempfile
+
+    if hasattr(socket, "AF_UNIX") and os.name != "nt":
+        path = args.socket
+        if not path:
+            runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+            if runtime_dir and os.path.isdir(runtime_dir):
+                path = os.path.join(runtime_dir, "gigaam-srt.sock")
+            else:
+                path = os.path.join(
+                    tempfile.gettempdir(), f"gigaam-srt-{os.getuid()}.sock"
+                )
+        return socket.AF_UNIX, path
+    return socket.AF_INET, ("127.0.0.1", args.port)
+
 
+def submit_to_server(
+    audio_paths: List[str],
+    args: argparse.Namespace,
+    output_override: Optional[str] = None,
+) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+    """Ask a running ``--serve`` instance to transcribe ``audio_paths``.
+
+    All paths are sent in one request so the server can batch them. Yields
+    ``(audio_path, output_path, error)`` as the server finishes each file, with
+    absolute paths and exactly one of ``output_path`` and ``error`` set. Raises
+    ``OSError`` when no server is listening and ``RuntimeError`` when the server
+    rejects the request.
+    """
+    import json
+    import socket
+
+    family, address = _server_address(args)
+    request = {
+        "files": [os.path.abspath(path) for path in audio_paths],
+        "output": os.path.abspath(output_override) if output_override else None,
+    }
+    with socket.socket(family, socket.SOCK_STREAM) as conn:
+        conn.connect(address)
+        with conn.makefile("rwb") as stream:
+            stream.write(json.dumps(request).encode("utf-8") + b"\n")
+            stream.flush()
+            for line in stream:
+                response = json.loads(line)
+                if "audio" not in response:
+                    raise RuntimeError(response.get("error", "Invalid server response"))
+                yield response["audio"], response.get("output"), response.get("error")
+
+
+def run_client(
+    media_items: List[Tuple[str, float]],
+    args: argparse.Namespace,
+    output_override: Optional[str] = None,
+) -> List[Tuple[str, float]]:
+    """Submit ``media_items`` to a running server in a single request.
+
+    Returns the items the server did not finish because it could not be
+    reached (or went away), so the caller can transcribe them locally instead.
+    """
+    remaining = {
+        os.path.abspath(path): (path, duration) for path, duration in media_items
+    }
+    LOGGER.info("Submitting %d file(s) to the transcription server", len(remaining))
     try:
-        import gigaam  # type: ignore
-    except ModuleNotFoundError as exc:
-        raise RuntimeError(
-            "The 'gigaam' package is required. Install it with "
-            "'pip install gigaam[longform]'."
-        ) from exc
+        for audio_path, output_path, error in submit_to_server(
+            [path for path, _ in media_items], args, output_override
+        ):
+            remaining.pop(audio_path, None)
+            if error is not None:
+                if not args.ignore_errors:
+                    raise RuntimeError(
+                        f"Transcription failed for {audio_path}: {error}"
+                    )
+                LOGGER.error("Transcription failed for %s: %s", audio_path, error)
+            else:
+                LOGGER.info("Saved subtitles to %s", output_path)
+    except OSError as exc:
+        LOGGER.warning("Transcription server is not reachable: %s", exc)
+    return list(remaining.values())
+
+
+def serve(service: TranscriptionService, args: argparse.Namespace) -> None:
+    """Transcribe files submitted by ``--client`` calls with ``service``.
+
+    Each connection sends one JSON line ``{"files": [...], "output": ...}``
+    (``output`` only with a single file) and receives one line per file as it
+    finishes, ``{"audio": ..., "output": ...}`` or ``{"audio": ..., "error": ...}``;
+    a rejected request gets a single ``{"error": ...}`` line. Files the local
+    scan would skip (missing, unsupported, or already subtitled) are answered
+    with an error line without being transcribed. The files of a request are
+    batched together on the shared service, and requests are handled in
+    threads, so concurrent clients keep every model busy.
+    """
+    import json
+    import socket
+    import socketserver
+
+    family, address = _server_address(args)
+
+    class TranscriptionHandler(socketserver.StreamRequestHandler):
+        def respond(self, response: Dict[str, Any]) -> None:
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+        @staticmethod
+        def rejection(path: str) -> Optional[str]:
+            """Apply the rules of :func:`collect_media_paths` to a submitted file."""
+            if not os.path.isfile(path):
+                return "Input file does not exist"
+            if not is_media_file(path):
+                return "Unsupported media file"
+            if has_adjacent_srt(path):
+                return "Subtitles already exist"
+            return None
+
+        def handle(self) -> None:
+            try:
+                request = json.loads(self.rfile.readline())
+                paths = list(request["files"])
+                output_path = request.get("output")
+                if output_path and len(paths) != 1:
+                    raise ValueError("An output path requires exactly one file")
+                # Any local user may reach the TCP fallback, so never let a
+                # request overwrite anything but a subtitle file.
+                if output_path and not output_path.lower().endswith(".srt"):
+                    raise ValueError("The output path must end with .srt")
+                accepted = []
+                for path in paths:
+                    reason = self.rejection(path)
+                    if reason is None:
+                        accepted.append(path)
+                    else:
+                        LOGGER.error("Rejected %s: %s", path, reason)
+                        self.respond({"audio": path, "error": reason})
+                futures = service.submit_many(
+                    list(zip(accepted, probe_durations(accepted))), output_path
+                )
+            except Exception as exc:  # pylint: disable=broad-except
+                LOGGER.error("Request failed: %s", exc)
+                self.respond({"error": str(exc)})
+                return
+            pending = dict(zip(futures, accepted))
+            try:
+                for future in concurrent.futures.as_completed(pending):
+                    audio_path = pending[future]
+                    try:
+                        response = {"audio": audio_path, "output": future.result()}
+                    except Exception as exc:  # pylint: disable=broad-except
+                        LOGGER.error("Transcription failed for %s: %s", audio_path, exc)
+                        response = {"audio": audio_path, "error": str(exc)}
+                    self.respond(response)
+            except OSError:
+                # The client went away; drop the files it was still waiting for.
+                for future in pending:
+                    future.cancel()
+
+    if family == socket.AF_INET:
+        base_class: Any = socketserver.ThreadingTCPServer
+    else:
+        base_class = socketserver.ThreadingUnixStreamServer
+        if os.path.exists(address):
+            with socket.socket(family, socket.SOCK_STREAM) as probe:
+                if probe.connect_ex(address) == 0:
+                    raise RuntimeError(f"A server is already listening on {address}")
+            try:
+                os.remove(address)
+            except OSError as exc:
+                raise RuntimeError(
+                    f"Cannot remove the stale socket {address}: {exc}"
+                ) from exc
+
+    class TranscriptionServer(base_class):  # type: ignore[misc, valid-type]
+        daemon_threads = True
+
+    with TranscriptionServer(address, TranscriptionHandler) as server:
+        LOGGER.info("Serving transcription requests on %s", address)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            LOGGER.info("Shutting down")
+        finally:
+            if family != socket.AF_INET:
+                with contextlib.suppress(OSError):
+                    os.remove(address)
+
+
+PRECISION_DTYPES = {"fp32": "float32", "fp16": "float16", "bf16": "bfloat16"}
+
+QUANTIZE_MODES = ("none", "int8")
+
+
+def load_asr_model(
+    model_name: str,
+    device: Optional[str],
+    precision: Optional[str] = None,
+    compile_encoder: bool = False,
+    quantize: str = "none",
+    rnnt_frame_sync: bool = False,
+) -> "GigaAMModel":
+    """Import required dependencies and return an initialized ASR model.
+
+    On CUDA the encoder is cast to ``precision`` (``fp16`` unless specified);
+    other devices always run in ``fp32``. With ``quantize="int8"`` the linear
+    and LSTM layers are dynamically quantized on CPU; activations are then
+    scaled per batch, so a chunk's transcript can depend slightly on the other
+    chunks in its batch. RNN-T models decode batches with
+    :class:`LabelLoopingRNNTDecoding`, or with :class:`FrameSyncRNNTDecoding` if
+    ``rnnt_frame_sync`` is set. With ``compile_encoder`` the encoder is wrapped
+    with ``torch.compile`` (CUDA graphs are captured on CUDA).
+    """
+
+    model = _load_gigaam().load_model(model_name, fp16_encoder=False, device=device)
+
+    import torch
+
+    if model._device.type == "cuda":  # pylint: disable=protected-access
+        model.encoder.to(getattr(torch, PRECISION_DTYPES[precision or "fp16"]))
+    elif precision not in (None, "fp32"):
+        LOGGER.warning("--precision %s is only supported on CUDA", precision)
+
+    if quantize == "int8":
+        if model._device.type == "cpu":  # pylint: disable=protected-access
+            import warnings
+
+            with warnings.catch_warnings():
+                # torch flags its eager quantization API as deprecated.
+                warnings.simplefilter("ignore", DeprecationWarning)
+                warnings.simplefilter("ignore", UserWarning)
+                torch.ao.quantization.quantize_dynamic(
+                    model,
+                    {torch.nn.Linear, torch.nn.LSTM},
+                    dtype=torch.qint8,
+                    inplace=True,
+                )
+        else:
+            LOGGER.warning("--quantize int8 is only supported on CPU")
+
+    if hasattr(model.decoding, "max_symbols"):  # RNN-T model
+        if rnnt_frame_sync:
+            model.decoding = FrameSyncRNNTDecoding(model.decoding)
+        else:
+            model.decoding = LabelLoopingRNNTDecoding(model.decoding)
+
+    if compile_encoder:
+        model.encoder = torch.compile(
+            model.encoder, mode="reduce-overhead", fullgraph=False
+        )
+    return model
+
+
+def warm_up_model(model: "GigaAMModel", args: argparse.Namespace) -> None:
+    """Run a dummy full-size batch so compilation happens before real inputs.
+
+    The bulk of the VAD chunks are close to ``--max-duration``, so warming up
+    that shape covers most of the batches seen later. It must run on the
+    thread that transcribes with ``model``: CUDA graphs recorded in
+    ``reduce-overhead`` mode are kept per thread.
+    """
+    import torch
+
+    LOGGER.info("Compiling the encoder, this may take a minute")
+    silence = torch.zeros(int(args.max_duration * SAMPLE_RATE))
+    transcribe_segments(model, [silence] * args.batch_size)
+
+
+def load_asr_models(args: argparse.Namespace) -> List["GigaAMModel"]:
+    """Load one model replica per GPU used for data-parallel transcription.
+
+    Several replicas are only created when no explicit ``--device`` is given and
+    more than one CUDA device is visible; ``--num-gpus`` caps their number.
+    """
+
+    devices: List[Optional[str]] = [args.device]
+    if args.device is None:
+        _load_gigaam()
+        import torch
+
+        num_gpus = torch.cuda.device_count()
+        if args.num_gpus is not None:
+            num_gpus = min(num_gpus, args.num_gpus)
+        if num_gpus > 1:
+            LOGGER.info(
+                "Loading %d model replicas for data-parallel inference", num_gpus
+            )
+            devices = [f"cuda:{index}" for index in range(num_gpus)]
+
+    models = []
+    for device in devices:
+        model = load_asr_model(
+            args.model,
+            device,
+            args.precision,
+            args.compile,
+            args.quantize,
+            args.rnnt_frame_sync,
+        )
+        models.append(model)
+    return models
 
-    return gigaam.load_model(model_name, device=device)
 
 def main() -> None:
     parser = argparse.ArgumentParser(
@@ -349,11 +1734,51 @@ def main() -> None:
         choices=["ctc", "rnnt"],
         help="ASR model to use (default: ctc)",
     )
+    parser.add_argument(
+        "--rnnt-frame-sync",
+        action="store_true",
+        help=(
+            "Decode RNN-T batches frame by frame with all chunks in lockstep "
+            "instead of label looping"
+        ),
+    )
     parser.add_argument(
         "--device",
         default=None,
         help="Torch device for inference (e.g. cuda or cpu)",
     )
+    parser.add_argument(
+        "--precision",
+        choices=sorted(PRECISION_DTYPES),
+        default=None,
+        help="Encoder precision on CUDA devices (default: fp16; CPU always uses fp32)",
+    )
+    parser.add_argument(
+        "--quantize",
+        choices=QUANTIZE_MODES,
+        default="none",
+        help=(
+            "Dynamic int8 quantization of linear and LSTM layers on CPU "
+            "(default: none)"
+        ),
+    )
+    parser.add_argument(
+        "--compile",
+        action="store_true",
+        help=(
+            "Compile the encoder with torch.compile; slower start-up, faster "
+            "inference on long runs"
+        ),
+    )
+    parser.add_argument(
+        "--num-gpus",
+        type=int,
+        default=None,
+        help=(
+            "Number of GPUs to spread files across when --device is not given "
+            "(default: all visible GPUs)"
+        ),
+    )
     parser.add_argument(
         "--hf-token",
         help="Hugging Face token for pyannote VAD used in long-form transcription",
@@ -376,6 +1801,27 @@ def main() -> None:
         default=0.2,
         help="Pause threshold (seconds) to start a new chunk",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=8,
+        help="Number of audio chunks decoded in a single forward pass (default: 8)",
+    )
+    parser.add_argument(
+        "--decode-batch-minutes",
+        type=float,
+        default=30.0,
+        help=(
+            "Total audio duration of the files decoded and transcribed together "
+            "(default: 30)"
+        ),
+    )
+    parser.add_argument(
+        "--decode-workers",
+        type=int,
+        default=4,
+        help="Number of ffmpeg processes decoding upcoming files (default: 4)",
+    )
     parser.add_argument(
         "-r",
         "--recursive",
@@ -414,6 +1860,39 @@ def main() -> None:
             "while the window remains open"
         ),
     )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help=(
+            "Keep the model loaded and transcribe files submitted by --client "
+            "invocations"
+        ),
+    )
+    parser.add_argument(
+        "--client",
+        action="store_true",
+        help=(
+            "Send the inputs to a running --serve instance instead of loading the "
+            "model (falls back to local transcription if none is running)"
+        ),
+    )
+    parser.add_argument(
+        "--socket",
+        default=None,
+        help=(
+            "UNIX socket path used by --serve/--client (default: a per-user socket "
+            "in $XDG_RUNTIME_DIR or the temp dir)"
+        ),
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_SERVER_PORT,
+        help=(
+            "Loopback TCP port used by --serve/--client where UNIX sockets are "
+            f"unavailable (default: {DEFAULT_SERVER_PORT})"
+        ),
+    )
     parser.set_defaults(ignore_errors=True, logging_enabled=True)
 
     args = parser.parse_args()
@@ -429,15 +1908,17 @@ def main() -> None:
     if args.directories:
         combined_inputs.extend(args.directories)
 
-    if not combined_inputs and not args.gui:
+    if not combined_inputs and not (args.gui or args.serve):
         parser.error("Please provide at least one media file or directory to process.")
 
     try:
-        audio_inputs = collect_media_paths(combined_inputs, args.recursive)
+        audio_inputs = collect_media_paths(
+            combined_inputs, args.recursive, probe=not args.client
+        )
     except (FileNotFoundError, ValueError) as exc:
         parser.error(str(exc))
 
-    if not audio_inputs and not args.gui:
+    if not audio_inputs and not (args.gui or args.serve):
         parser.error(
             "No audio or video files without adjacent SRT subtitles were found."
         )
@@ -448,32 +1929,74 @@ def main() -> None:
     if args.gui and args.output:
         parser.error("--output cannot be used together with --gui mode")
 
+    if args.serve and (args.gui or args.client):
+        parser.error("--serve cannot be combined with --gui or --client")
+
+    if args.client and args.gui:
+        parser.error("--client cannot be used together with --gui mode")
+
     if args.output and len(audio_inputs) > 1:
         parser.error("--output can only be used with a single input media file")
 
+    if args.client and args.output and not args.output.lower().endswith(".srt"):
+        parser.error("--output must end with .srt when used with --client")
+
+    if args.batch_size < 1:
+        parser.error("--batch-size must be a positive integer")
+
+    if args.decode_batch_minutes <= 0:
+        parser.error("--decode-batch-minutes must be positive")
+
+    if args.decode_workers < 1:
+        parser.error("--decode-workers must be a positive integer")
+
+    if args.num_gpus is not None and args.num_gpus < 1:
+        parser.error("--num-gpus must be a positive integer")
+
+    if args.client:
+        try:
+            audio_inputs = run_client(audio_inputs, args, output_override=args.output)
+        except RuntimeError as exc:
+            parser.error(str(exc))
+        if not audio_inputs:
+            return
+        LOGGER.info("Transcribing the remaining file(s) locally")
+
     if args.hf_token:
         os.environ["HF_TOKEN"] = args.hf_token
 
     try:
-        model = load_asr_model(args.model, args.device)
+        models = load_asr_models(args)
     except RuntimeError as exc:
         parser.error(str(exc))
 
-    if args.gui:
-        try:
-            launch_drag_and_drop_gui(model, args, audio_inputs or None)
-        except RuntimeError as exc:
-            parser.error(str(exc))
-        return
+    with TranscriptionService(models, args) as service:
+        if args.gui:
+            try:
+                launch_drag_and_drop_gui(
+                    service, [path for path, _ in audio_inputs] or None
+                )
+            except RuntimeError as exc:
+                parser.error(str(exc))
+            return
 
-    for audio_path in audio_inputs:
-        output_path = transcribe_audio_file(
-            model, audio_path, args, output_override=args.output
-        )
-        if output_path is None and not args.ignore_errors:
-            # The helper only returns ``None`` when ``ignore_errors`` is enabled,
-            # so this branch should normally never be reached.
-            break
+        futures = service.submit_many(audio_inputs, output_override=args.output)
+        pending = {
+            future: audio_path for future, (audio_path, _) in zip(futures, audio_inputs)
+        }
+        for future in concurrent.futures.as_completed(pending):
+            try:
+                future.result()
+            except Exception as exc:  # pylint: disable=broad-except
+                if not args.ignore_errors:
+                    raise
+                LOGGER.error("Transcription failed for %s: %s", pending[future], exc)
+
+        if args.serve:
+            try:
+                serve(service, args)
+            except RuntimeError as exc:
+                parser.error(str(exc))
 
 
 if __name__ == "__main__":